@@ -1,5 +1,14 @@
 #!/usr/bin/env python3
 
+import dns.entropy
+import dns.flags
+import dns.inet
+import dns.message
+import dns.name
+import dns.query
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
 import dns.resolver
 import argparse
 import random
@@ -8,22 +17,38 @@ import signal
 import sys
 import time
 from colorama import Fore, Style, init
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Event, Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Event, Thread, Lock, local, get_ident
 from unidecode import unidecode
 import socket
 import os
+from collections import defaultdict
 
 # Initialize colorama
 init(autoreset=True)
 
 stop_event = Event()
-domain_count = 0
-successful_domains = []
+domain_counts = defaultdict(int)  # Thread ident -> domains processed by that worker
+successful_count = 0
+output_file = None  # successful_domains.txt, opened by main()
+output_pool = None  # Single thread printing and writing hits, created by main()
 start_time = None
-txt_record_to_check = None
+txt_records_to_check = frozenset()  # Encoded once, TXT strings are compared as bytes
 tlds = ['.com', '.se', '.no', '.dk']  # Default TLDs
-lock = Lock()  # Lock for writing to the file
+txt_cache = {}  # domain -> expiry of a cached NXDOMAIN/NoAnswer response
+txt_cache_lock = Lock()
+TXT_CACHE_TTL = 900  # Seconds to keep a cached answer
+TXT_CACHE_MAX_SIZE = 100_000
+seen_words = set()  # Random words already generated in auto mode
+seen_words_lock = Lock()
+SEEN_WORDS_MAX_SIZE = 1_000_000
+RANDOM_WORD_LENGTHS = range(3, 9)
+RANDOM_WORD_BATCH = 256  # Random words generated at a time by each worker
+thread_local = local()  # Per worker thread resolver and DNS sockets
+RESOLVER_TIMEOUT = 1.0  # Time to wait for each attempt
+RESOLVER_LIFETIME = 3.0  # Total time for all attempts combined, the last one gets what is left
+QUERY_RETRIES = 2  # Resends after a timeout or SERVFAIL
+answer_cache = dns.resolver.LRUCache(max_size=100_000)  # Positive answers shared by all workers
 
 def interpolate_color(color1, color2, factor):
     """Interpolate between two RGB colors."""
@@ -33,7 +58,8 @@ def rgb_to_ansi(r, g, b):
     """Convert RGB to ANSI color code."""
     return f'\033[38;2;{r};{g};{b}m'
 
-def print_logo_and_instructions():
+def build_rainbow_logo():
+    """Return the logo colored with a gradient between the logo colors."""
     logo = """
   ▄ .▄▪  ▄▄▄▄▄▄▄▄ .• ▌ ▄ ·. .▄▄ · ▄▄▄ . ▄▄·  
  ██▪▐███ •██  ▀▄.▀··██ ▐███▪▐█ ▀. ▀▄.▀·▐█ ▌▪ 
@@ -47,9 +73,9 @@ def print_logo_and_instructions():
     ]
 
     num_colors = len(colors)
-    rainbow_logo = ""
+    rainbow_logo = []
     color_index = 0
-    num_chars = sum(len(line) for line in logo.split("\n"))
+    num_chars = len(logo) - logo.count("\n")
     for char in logo:
         if char != " " and char != "\n":
             factor = (color_index / num_chars) * (num_colors - 1)
@@ -57,13 +83,17 @@ def print_logo_and_instructions():
             next_idx = min(idx + 1, num_colors - 1)
             local_factor = factor - idx
             color = interpolate_color(colors[idx], colors[next_idx], local_factor)
-            rainbow_logo += rgb_to_ansi(*color) + char
+            rainbow_logo.append(rgb_to_ansi(*color) + char)
             color_index += 1
         else:
-            rainbow_logo += char
+            rainbow_logo.append(char)
+    return "".join(rainbow_logo)
+
+RAINBOW_LOGO = build_rainbow_logo()
 
+def print_logo_and_instructions():
     instructions = f"""
-    {rainbow_logo}{Style.RESET_ALL}
+    {RAINBOW_LOGO}{Style.RESET_ALL}
     {Fore.LIGHTBLACK_EX}Improve your reconnaissance by {Fore.RED}hitemSec{Style.RESET_ALL}
     {Fore.LIGHTBLACK_EX}How-To: {Fore.YELLOW}python3 .\\txtchecker.py -h{Style.RESET_ALL}
 
@@ -80,7 +110,7 @@ def print_logo_and_instructions():
     -a, --auto          Enable auto mode for random domain generation (3-8 characters)
     -t, --time          Run time in seconds for auto mode (used together with -a for time limited run)
     -d, --dns           DNS server to use for queries (required)
-    -x, --txt           TXT record to look for (required)
+    -x, --txt           TXT record to look for (required, repeat to look for several)
     --tlds              Comma-separated list of TLDs to use (default: .com,.se,.no,.dk)
     
     {Fore.YELLOW}Examples:{Style.RESET_ALL}
@@ -95,99 +125,331 @@ def print_logo_and_instructions():
     print(instructions)
 
 def load_words(file_path):
-    """Load words from a file and normalize them."""
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return [unidecode(line.strip()) for line in file]
+    """Yield the words of a file, normalized, without reading the whole file into memory.
+
+    Pure ASCII lines are decoded directly, only other lines go through unidecode.
+    """
+    with open(file_path, 'rb') as file:
+        for line in file:
+            line = line.strip()
+            try:
+                yield line.decode('ascii')
+            except UnicodeDecodeError:
+                yield unidecode(line.decode('utf-8', 'replace'))
 
 def generate_domains(word, tlds):
     """Generate domain names from a word for the specified TLDs."""
     return [f"{word}{tld}" for tld in tlds]
 
-def generate_random_domain(tlds):
-    """Generate a random domain name with a length between 3 and 8 characters for the specified TLDs."""
-    length = random.randint(3, 8)
-    word = ''.join(random.choices(string.ascii_lowercase, k=length))
-    return [f"{word}{tld}" for tld in tlds]
+def generate_random_words(batch):
+    """Generate a batch of random words with a length between 3 and 8 characters.
 
-def fetch_txt_records(domain, resolver):
-    """Fetch and return all TXT records for a domain."""
-    try:
-        answers = resolver.resolve(domain, 'TXT')
-        txt_records = []
-        for rdata in answers:
-            for txt_string in rdata.strings:
-                txt_records.append(txt_string.decode())
-        return txt_records
-    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout, dns.resolver.NoNameservers) as e:
+    Words already generated during this run are left out, so the batch may be smaller than requested.
+    """
+    lengths = random.choices(RANDOM_WORD_LENGTHS, k=batch)
+    letters = ''.join(random.choices(string.ascii_lowercase, k=sum(lengths)))
+    words = []
+    pos = 0
+    with seen_words_lock:
+        for length in lengths:
+            word = letters[pos:pos + length]
+            pos += length
+            if word in seen_words:
+                continue
+            if len(seen_words) < SEEN_WORDS_MAX_SIZE:
+                seen_words.add(word)
+            words.append(word)
+    return words
+
+def get_cached_txt_records(domain, resolver):
+    """Return cached TXT records for a domain, or None if not cached or expired."""
+    answer = resolver.cache.get((dns.name.from_text(domain), dns.rdatatype.TXT, dns.rdataclass.IN))
+    if answer is not None:
+        return get_txt_strings(answer.rrset)
+    with txt_cache_lock:
+        expiry = txt_cache.get(domain)
+        if expiry is None:
+            return None
+        if expiry < time.monotonic():
+            del txt_cache[domain]
+            return None
         return []
-    return []
 
-def check_txt(domain, resolver):
-    """Check if the domain has the specified TXT record."""
+def cache_negative_response(domain):
+    """Cache an NXDOMAIN/NoAnswer response, which the resolver's LRUCache does not store."""
+    with txt_cache_lock:
+        if domain not in txt_cache and len(txt_cache) >= TXT_CACHE_MAX_SIZE:
+            # Evict the oldest entry, dicts keep insertion order
+            del txt_cache[next(iter(txt_cache))]
+        txt_cache[domain] = time.monotonic() + TXT_CACHE_TTL
+
+def get_resolver(nameserver_ip):
+    """Return the resolver of the current worker thread, creating it on first use."""
+    resolver = getattr(thread_local, 'resolver', None)
+    if resolver is None:
+        resolver = dns.resolver.Resolver(configure=False)
+        resolver.nameservers = [nameserver_ip]
+        resolver.timeout = RESOLVER_TIMEOUT
+        resolver.lifetime = RESOLVER_LIFETIME
+        resolver.cache = answer_cache
+        thread_local.resolver = resolver
+    return resolver
+
+def get_udp_socket(nameserver):
+    """Return the persistent UDP socket of the current worker thread."""
+    sock = getattr(thread_local, 'udp_sock', None)
+    if sock is None:
+        sock = socket.socket(dns.inet.af_for_address(nameserver), socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        thread_local.udp_sock = sock
+    return sock
+
+def get_tcp_socket(nameserver, port, timeout):
+    """Return the persistent TCP connection of the current worker thread, connecting if needed."""
+    sock = getattr(thread_local, 'tcp_sock', None)
+    if sock is None:
+        sock = socket.create_connection((nameserver, port), timeout=timeout)
+        sock.setblocking(False)
+        thread_local.tcp_sock = sock
+    return sock
+
+def close_tcp_socket():
+    """Close the TCP connection of the current worker thread."""
+    sock = getattr(thread_local, 'tcp_sock', None)
+    if sock is not None:
+        sock.close()
+        thread_local.tcp_sock = None
+
+def query_tcp(query, resolver, deadline):
+    """Send a query over the worker thread's persistent TCP connection (RFC 7766), giving up at deadline."""
+    nameserver = resolver.nameservers[0]
+    for attempt in range(2):
+        timeout = deadline - time.time()
+        if timeout <= 0:
+            raise dns.exception.Timeout
+        try:
+            sock = get_tcp_socket(nameserver, resolver.port, timeout)
+            return dns.query.tcp(query, nameserver, timeout=timeout, port=resolver.port, sock=sock)
+        except (OSError, EOFError):
+            # The server may have closed the idle connection, reconnect once
+            close_tcp_socket()
+            if attempt:
+                raise
+        except dns.exception.DNSException:
+            # A timed out or malformed exchange leaves the stream out of sync
+            close_tcp_socket()
+            raise
+
+def query_txt_many(domains, resolver):
+    """Query the TXT records of several domains with all queries in flight at once.
+
+    The queries are sent back-to-back on the worker thread's persistent UDP
+    socket and the responses are matched by message ID. Truncated responses
+    are retried over TCP. Queries that time out or get a SERVFAIL are
+    resent up to QUERY_RETRIES times with a short backoff, within the
+    resolver's lifetime. Returns a dict of domain -> response; domains that
+    still failed are left out.
+    """
+    nameserver = resolver.nameservers[0]
+    af = dns.inet.af_for_address(nameserver)
+    destination = dns.inet.low_level_address_tuple((nameserver, resolver.port), af)
+    sock = get_udp_socket(nameserver)
+    deadline = time.time() + resolver.lifetime
+    pending = {}
+    for domain in domains:
+        query = dns.message.make_query(domain, dns.rdatatype.TXT)
+        while query.id in pending:
+            query.id = dns.entropy.random_16()
+        pending[query.id] = (domain, query)
+    responses = {}
+    for attempt in range(QUERY_RETRIES + 1):
+        if attempt:
+            time.sleep(0.05 * attempt)
+        now = time.time()
+        if now >= deadline:
+            break
+        expiration = min(now + resolver.timeout, deadline)
+        for domain, query in pending.values():
+            dns.query.send_udp(sock, query, destination, expiration)
+        waiting = set(pending)
+        while waiting:
+            try:
+                response, _ = dns.query.receive_udp(sock, destination, expiration, ignore_unexpected=True, ignore_errors=True)
+            except dns.exception.Timeout:
+                break
+            domain, query = pending.get(response.id, (None, None))
+            if query is None or not query.is_response(response):
+                # Late answer to an earlier query on this socket
+                continue
+            waiting.discard(response.id)
+            rcode = response.rcode()
+            if rcode == dns.rcode.SERVFAIL:
+                # Transient server failure, resend on the next attempt
+                continue
+            del pending[response.id]
+            if rcode not in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+                # REFUSED, NOTIMP, FORMERR... will not change on a resend
+                continue
+            if response.flags & dns.flags.TC:
+                try:
+                    response = query_tcp(query, resolver, deadline)
+                except (OSError, EOFError, dns.exception.DNSException):
+                    continue
+            responses[domain] = response
+        if not pending:
+            break
+    return responses
+
+def get_txt_strings(rrset):
+    """Return the raw TXT strings of an rrset as bytes."""
+    txt_records = []
+    for rdata in rrset:
+        txt_records.extend(rdata.strings)
+    return txt_records
+
+def fetch_txt_records_many(domains, resolver):
+    """Fetch and return the TXT records of several domains as a dict of domain -> records."""
+    results = {}
+    uncached = []
+    for domain in domains:
+        txt_records = get_cached_txt_records(domain, resolver)
+        if txt_records is None:
+            uncached.append(domain)
+        else:
+            results[domain] = txt_records
+    responses = {}
+    if uncached:
+        try:
+            responses = query_txt_many(uncached, resolver)
+        except OSError:
+            pass
+    for domain in uncached:
+        response = responses.get(domain)
+        results[domain] = []
+        if response is None or response.rcode() not in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+            # Transient failures are not cached
+            continue
+        qname = dns.name.from_text(domain)
+        answer = dns.resolver.Answer(qname, dns.rdatatype.TXT, dns.rdataclass.IN, response)
+        if answer.rrset is None:
+            cache_negative_response(domain)
+        else:
+            resolver.cache.put((qname, dns.rdatatype.TXT, dns.rdataclass.IN), answer)
+            results[domain] = get_txt_strings(answer.rrset)
+    return results
+
+def record_hit(domain):
+    """Print a successful domain and append it to the output file.
+
+    Runs on the single output thread, so writes need no locking.
+    """
+    global successful_count
+    sys.stdout.write(f"\n{Fore.GREEN}[+] Found TXT record on {domain}\n")
+    successful_count += 1
+    try:
+        output_file.write(f"{domain}\n")
+    except Exception as e:
+        print(f"{Fore.RED}Error writing to file: {e}{Style.RESET_ALL}")
+
+def check_txt(domain, txt_records):
+    """Check if the TXT records of the domain contain one of the specified TXT records.
+
+    Hits are handed to the output thread so the DNS worker can move on right away.
+    """
     if stop_event.is_set():
         return False
-    txt_records = fetch_txt_records(domain, resolver)
     for txt in txt_records:
-        if txt.strip() == txt_record_to_check:
-            sys.stdout.write(f"\n{Fore.GREEN}[+] Found TXT record on {domain}\n")
-            successful_domains.append(domain)
-            with lock:
-                try:
-                    with open('successful_domains.txt', 'a') as f:
-                        f.write(f"{domain}\n")
-                except Exception as e:
-                    print(f"{Fore.RED}Error writing to file: {e}{Style.RESET_ALL}")
+        if txt.strip() in txt_records_to_check:
+            output_pool.submit(record_hit, domain)
             return True
     return False
 
-def check_domains(tlds, resolver, auto=False):
-    """Check multiple domains generated randomly."""
-    global domain_count
-    while not stop_event.is_set():
-        domains = generate_random_domain(tlds)
-        for domain in domains:
-            if stop_event.is_set():
-                break
-            domain_count += 1
-            if check_txt(domain, resolver):
-                successful_domains.append(domain)
-    return successful_domains
-
-def check_domains_from_word(word, tlds, resolver):
-    """Check multiple domains generated from a word."""
-    global domain_count
-    domains = generate_domains(word, tlds)
-    for domain in domains:
-        if stop_event.is_set():
+def check_domains(tlds, nameserver_ip, auto=False):
+    """Check a batch of randomly generated domains."""
+    resolver = get_resolver(nameserver_ip)
+    ident = get_ident()
+    is_stopped = stop_event.is_set
+    for word in generate_random_words(RANDOM_WORD_BATCH):
+        # Each word is a full round of queries, so stop as soon as asked
+        if is_stopped():
             break
-        domain_count += 1
-        if check_txt(domain, resolver):
-            successful_domains.append(domain)
-    return successful_domains
+        domains = generate_domains(word, tlds)
+        domain_counts[ident] += len(domains)
+        for domain, txt_records in fetch_txt_records_many(domains, resolver).items():
+            check_txt(domain, txt_records)
+
+def check_domains_from_word(word, tlds, nameserver_ip):
+    """Check multiple domains generated from a word, reporting any exception with the word."""
+    if stop_event.is_set():
+        return
+    try:
+        resolver = get_resolver(nameserver_ip)
+        domains = generate_domains(word, tlds)
+        domain_counts[get_ident()] += len(domains)
+        for domain, txt_records in fetch_txt_records_many(domains, resolver).items():
+            check_txt(domain, txt_records)
+    except Exception as exc:
+        print(f"{Fore.RED}Exception occurred while checking {word}: {exc}")
 
 def signal_handler(sig, frame):
     stop_event.set()
     print(f'\n{Fore.RED}Process interrupted. Exiting gracefully...')
 
+def get_domain_count():
+    """Return the number of domains processed by all workers."""
+    # list() copies the values in one step, workers may add entries meanwhile
+    return sum(list(domain_counts.values()))
+
+def get_status_fd():
+    """Return the stdout file descriptor if the status line can bypass colorama, else None.
+
+    Only a TTY outside Windows takes the ANSI codes as they are; anywhere else
+    colorama has to convert or strip them, so sys.stdout must be used.
+    """
+    if os.name == 'nt':
+        return None
+    try:
+        if sys.stdout.isatty():
+            return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        pass
+    return None
+
 def update_domain_count():
-    """Update the domain count display dynamically."""
+    """Update the domain count display dynamically.
+
+    On a TTY that needs no conversion the status line is written straight to the
+    stdout file descriptor, bypassing the buffered sys.stdout. It is refreshed
+    every second, or every half second while the count moves quickly.
+    """
+    fd = get_status_fd()
+    prefix = f"\r{Fore.YELLOW}"
+    last_count = -1
+    last_write = 0
     while not stop_event.is_set():
-        elapsed_time = time.time() - start_time
-        sys.stdout.write(f"\r{Fore.YELLOW}{domain_count} domains processed. {Fore.CYAN}Time elapsed: {elapsed_time:.2f} seconds")
-        sys.stdout.flush()
-        time.sleep(1)
+        count = get_domain_count()
+        now = time.time()
+        if count - last_count > 100 or now - last_write >= 1:
+            status = f"{prefix}{count} domains processed. {Fore.CYAN}Time elapsed: {now - start_time:.2f} seconds"
+            if fd is None:
+                sys.stdout.write(status)
+                sys.stdout.flush()
+            else:
+                os.write(fd, status.encode())
+            last_count = count
+            last_write = now
+        stop_event.wait(0.5)
 
 def print_final_output():
     """Print the final output when the script ends."""
-    print(f"\n{Fore.YELLOW}{domain_count} domains processed.")
-    if successful_domains:
+    print(f"\n{Fore.YELLOW}{get_domain_count()} domains processed.")
+    if successful_count:
         print(f"{Fore.GREEN}Successful domains written to successful_domains.txt")
     else:
         print(f"{Fore.YELLOW}No domains with the specified TXT record were found.")
 
 def main():
-    global domain_count, start_time, txt_record_to_check, tlds
-    found_any = False
+    global start_time, txt_records_to_check, tlds, output_file, output_pool
 
     print_logo_and_instructions()
 
@@ -197,7 +459,7 @@ def main():
     parser.add_argument('-a', '--auto', action='store_true', help="Enable auto mode for random domain generation (3-8 characters)")
     parser.add_argument('-t', '--time', type=int, help="Run time in seconds for auto mode (used together with -a for time limited run)")
     parser.add_argument('-d', '--dns', required=True, help="DNS server to use for queries")
-    parser.add_argument('-x', '--txt', required=True, help="TXT record to look for")
+    parser.add_argument('-x', '--txt', required=True, action='append', help="TXT record to look for (repeat to look for several)")
     parser.add_argument('--tlds', help="Comma-separated list of TLDs to use (default: .com,.se,.no,.dk)")
     args = parser.parse_args()
 
@@ -209,7 +471,7 @@ def main():
         print(f"{Fore.RED}Please provide a word list file or enable auto mode.")
         sys.exit(1)
 
-    txt_record_to_check = args.txt
+    txt_records_to_check = frozenset(txt.encode() for txt in args.txt)
 
     if args.tlds:
         tlds = args.tlds.split(',')
@@ -217,11 +479,12 @@ def main():
     # Register signal handler for graceful termination
     signal.signal(signal.SIGINT, signal_handler)
 
-    # Resolver configuration
-    resolver = dns.resolver.Resolver()
-    resolver.nameservers = [socket.gethostbyname(args.dns)]
-    resolver.timeout = 3  # Time to wait for each attempt
-    resolver.lifetime = 3  # Total time for all attempts combined
+    # Resolve the DNS server once, each worker builds its own resolver for it
+    nameserver_ip = socket.gethostbyname(args.dns)
+
+    # Line buffered so every hit is on disk as soon as it is found
+    output_file = open('successful_domains.txt', 'a', buffering=1)
+    output_pool = ThreadPoolExecutor(max_workers=1)
 
     start_time = time.time()
 
@@ -230,31 +493,31 @@ def main():
 
     try:
         with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            # Bound the submitted work so memory stays constant regardless of the run length or list size
+            in_flight = BoundedSemaphore(args.workers * 4)
             if args.auto:
-                futures = [executor.submit(check_domains, tlds, resolver, auto=True) for _ in range(args.workers)]
                 while not stop_event.is_set():
-                    time.sleep(1)
                     if args.time and (time.time() - start_time) > args.time:
                         stop_event.set()
                         break
+                    if not in_flight.acquire(timeout=1):
+                        continue
+                    future = executor.submit(check_domains, tlds, nameserver_ip, auto=True)
+                    future.add_done_callback(lambda f: in_flight.release())
             else:
-                words = load_words(args.list)
-                futures = {executor.submit(check_domains_from_word, word, tlds, resolver): word for word in words}
-                for future in as_completed(futures):
+                for word in load_words(args.list):
                     if stop_event.is_set():
                         break
-                    word = futures[future]
-                    try:
-                        results = future.result()
-                        if results:
-                            found_any = True
-                    except Exception as exc:
-                        print(f"{Fore.RED}Exception occurred while checking {word}: {exc}")
+                    in_flight.acquire()
+                    future = executor.submit(check_domains_from_word, word, tlds, nameserver_ip)
+                    future.add_done_callback(lambda f: in_flight.release())
     except KeyboardInterrupt:
         signal_handler(None, None)
     finally:
         stop_event.set()
         count_thread.join()
+        output_pool.shutdown(wait=True)
+        output_file.close()
         print_final_output()
 
 if __name__ == "__main__":